@@ -1,4 +1,6 @@
 """Recall agent for retrieval orchestration."""
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any, Optional
 
 from second_brain.contracts.context_packet import (
@@ -24,14 +26,15 @@ class RecallOrchestrator:
         self,
         memory_service: MemoryService,
         rerank_service: VoyageRerankService,
-        feature_flags: Optional[dict[str, bool]] = None,
-        provider_status: Optional[dict[str, str]] = None,
+        feature_flags: Optional[Mapping[str, bool]] = None,
+        provider_status: Optional[Mapping[str, str]] = None,
         config: Optional[dict[str, Any]] = None,
     ):
         self.memory_service = memory_service
         self.rerank_service = rerank_service
-        self.feature_flags = feature_flags or get_feature_flags()
-        self.provider_status = provider_status or get_provider_status()
+        # Freeze config at init so callers can't change routing between runs
+        self.feature_flags = MappingProxyType(dict(feature_flags or get_feature_flags()))
+        self.provider_status = MappingProxyType(dict(provider_status or get_provider_status()))
         self.config = config or get_default_config()
     
     def run(
@@ -77,12 +80,16 @@ class RecallOrchestrator:
         
         # Step 2: Retrieve candidates from memory service
         skip_external_rerank = route_options.get("skip_external_rerank", False)
-        candidates, provider_metadata = self.memory_service.search_memories(
-            query=request.query,
-            top_k=request.top_k,
-            threshold=request.threshold,
-            rerank=not skip_external_rerank,
-        )
+        if validation_mode and force_branch == BranchCodes.EMPTY_SET:
+            # Forced empty set discards candidates, so skip retrieval and rerank
+            candidates: list[ContextCandidate] = []
+        else:
+            candidates, provider_metadata = self.memory_service.search_memories(
+                query=request.query,
+                top_k=request.top_k,
+                threshold=request.threshold,
+                rerank=not skip_external_rerank,
+            )
         
         # Step 3: Apply external rerank if needed (non-Mem0 paths)
         external_rerank_enabled = self.feature_flags.get("external_rerank_enabled", True)
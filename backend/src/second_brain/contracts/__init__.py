@@ -4,6 +4,7 @@ from second_brain.contracts.context_packet import (
     ConfidenceSummary,
     ContextPacket,
     NextAction,
+    RetrievalMode,
     RetrievalRequest,
     RetrievalResponse,
 )
@@ -13,6 +14,7 @@ __all__ = [
     "ConfidenceSummary",
     "ContextPacket",
     "NextAction",
+    "RetrievalMode",
     "RetrievalRequest",
     "RetrievalResponse",
 ]
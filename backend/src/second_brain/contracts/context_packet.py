@@ -1,8 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Literal, Any
 from datetime import datetime, timezone
 
 
+RetrievalMode = Literal["fast", "accurate", "conversation"]
+
+
 class ContextCandidate(BaseModel):
     """Represents a single retrieval candidate."""
     id: str
@@ -39,8 +42,10 @@ class NextAction(BaseModel):
 
 class RetrievalRequest(BaseModel):
     """Request to retrieval module."""
+    model_config = ConfigDict(frozen=True)
+    
     query: str
-    mode: Literal["fast", "accurate", "conversation"] = "conversation"
+    mode: RetrievalMode = "conversation"
     top_k: int = Field(default=5, ge=1)
     threshold: float = Field(default=0.6, ge=0.0, le=1.0)
     provider_override: str | None = None
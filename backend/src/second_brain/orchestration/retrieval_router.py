@@ -1,5 +1,6 @@
-from typing import Literal
-from second_brain.contracts.context_packet import RetrievalRequest
+from collections.abc import Mapping
+
+from second_brain.contracts.context_packet import RetrievalMode, RetrievalRequest
 
 
 class ProviderStatus:
@@ -14,10 +15,10 @@ class RouteDecision:
     
     @staticmethod
     def select_route(
-        mode: Literal["fast", "accurate", "conversation"],
+        mode: RetrievalMode,
         available_providers: list[str],
-        feature_flags: dict[str, bool],
-        provider_status: dict[str, str]
+        feature_flags: Mapping[str, bool],
+        provider_status: Mapping[str, str]
     ) -> tuple[str, dict]:
         """
         Select provider and route options deterministically.
@@ -60,7 +61,7 @@ class RouteDecision:
         return "none", {"skip_external_rerank": False}
     
     @staticmethod
-    def check_feature_flags(feature_flags: dict[str, bool]) -> list[str]:
+    def check_feature_flags(feature_flags: Mapping[str, bool]) -> list[str]:
         """Get list of providers enabled via feature flags."""
         enabled = []
         
@@ -78,8 +79,8 @@ class RouteDecision:
 
 def route_retrieval(
     request: RetrievalRequest,
-    provider_status: dict[str, str] | None = None,
-    feature_flags: dict[str, bool] | None = None
+    provider_status: Mapping[str, str] | None = None,
+    feature_flags: Mapping[str, bool] | None = None
 ) -> tuple[str, dict]:
     """
     Route retrieval request to appropriate provider.
@@ -1,10 +1,11 @@
 """Memory service with Mem0 provider."""
 from dataclasses import dataclass
-from typing import Any, Optional
+from operator import attrgetter
+from typing import Any, Optional, Sequence
 from second_brain.contracts.context_packet import ContextCandidate
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MemorySearchResult:
     """Normalized memory search result."""
     id: str
@@ -20,7 +21,7 @@ class MemoryService:
     def __init__(self, provider: str = "mem0", config: Optional[dict[str, Any]] = None):
         self.provider = provider
         self.config = config or {}
-        self._mock_data: list[MemorySearchResult] | None = None
+        self._mock_data: tuple[MemorySearchResult, ...] | None = None
     
     def search_memories(
         self,
@@ -82,8 +83,7 @@ class MemoryService:
         # Don't filter by threshold - branch determination needs to see low-confidence results
         if self._mock_data is None:
             return []
-        results = list(self._mock_data)
-        results.sort(key=lambda r: r.confidence, reverse=True)
+        results = sorted(self._mock_data, key=attrgetter("confidence"), reverse=True)
         return results[:top_k]
     
     def _search_fallback(
@@ -140,10 +140,11 @@ class MemoryService:
                 ),
             ]
     
-    def set_mock_data(self, data: list[MemorySearchResult]) -> None:
+    def set_mock_data(self, data: Sequence[MemorySearchResult]) -> None:
         """Set mock data for deterministic testing."""
-        self._mock_data = data
+        # tuple() returns tuples as-is, so shared fixtures aren't copied
+        self._mock_data = tuple(data)
     
     def clear_mock_data(self) -> None:
         """Clear mock data."""
-        self._mock_data = []
+        self._mock_data = ()
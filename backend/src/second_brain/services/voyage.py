@@ -1,8 +1,15 @@
 """Voyage AI reranking service."""
+from heapq import nlargest
+from operator import itemgetter
 from typing import Sequence
 from second_brain.contracts.context_packet import ContextCandidate
 
 
+def _as_list(candidates: Sequence[ContextCandidate]) -> list[ContextCandidate]:
+    """Return list inputs unchanged; copy other sequences."""
+    return candidates if isinstance(candidates, list) else list(candidates)
+
+
 class VoyageRerankService:
     """External reranking service wrapper."""
     
@@ -25,31 +32,33 @@ class VoyageRerankService:
             top_k: Maximum results to return
         
         Returns:
-            Tuple of (reranked candidates, metadata with rerank_type)
+            Tuple of (reranked candidates, metadata with rerank_type).
+            Bypass paths return a list input as-is rather than a copy,
+            so callers that mutate the result mutate their own input.
         """
-        metadata = {
-            "rerank_type": "none",
-            "rerank_model": self.model,
-        }
-        
-        # Bypass mode: disabled or empty candidates
-        if not self.enabled or not candidates:
-            metadata["rerank_type"] = "none"
-            metadata["bypass_reason"] = "disabled" if not self.enabled else "no_candidates"
-            return list(candidates), metadata
+        # Bypass paths return before any rerank work
+        if not self.enabled:
+            return _as_list(candidates), self._bypass_metadata("disabled")
+        if not candidates:
+            return _as_list(candidates), self._bypass_metadata("no_candidates")
         
         # Single candidate: no rerank needed
         if len(candidates) == 1:
-            metadata["rerank_type"] = "none"
-            metadata["bypass_reason"] = "single_candidate"
-            return list(candidates), metadata
+            return _as_list(candidates), self._bypass_metadata("single_candidate")
         
         # Deterministic mock rerank for testing (no external API call)
         # In production, this would call Voyage AI API
         reranked = self._mock_rerank(query, candidates, top_k)
-        metadata["rerank_type"] = "external"
         
-        return reranked, metadata
+        return reranked, {"rerank_type": "external", "rerank_model": self.model}
+    
+    def _bypass_metadata(self, reason: str) -> dict[str, str]:
+        """Metadata for a call that skipped reranking."""
+        return {
+            "rerank_type": "none",
+            "rerank_model": self.model,
+            "bypass_reason": reason,
+        }
     
     def _mock_rerank(
         self,
@@ -64,25 +73,30 @@ class VoyageRerankService:
         query-content overlap (deterministic).
         """
         scored = []
-        query_terms = set(query.lower().split())
+        query_terms = frozenset(query.lower().split())
         
         for candidate in candidates:
-            content_terms = set(candidate.content.lower().split())
-            overlap = len(query_terms & content_terms)
+            # intersection() takes the token list directly, skipping a per-candidate set
+            overlap = len(query_terms.intersection(candidate.content.lower().split()))
             
             # Adjust confidence based on term overlap (mock behavior)
             adjusted_confidence = min(1.0, candidate.confidence + (overlap * 0.05))
-            
-            new_candidate = ContextCandidate(
+            scored.append((adjusted_confidence, candidate))
+        
+        # Top-k by adjusted confidence descending (ties keep input order);
+        # nlargest only pays off when there is something to cut
+        if len(scored) > top_k:
+            top = nlargest(top_k, scored, key=itemgetter(0))
+        else:
+            top = sorted(scored, key=itemgetter(0), reverse=True)
+        
+        return [
+            ContextCandidate(
                 id=candidate.id,
                 content=candidate.content,
                 source=candidate.source,
                 confidence=adjusted_confidence,
                 metadata={**candidate.metadata, "rerank_adjusted": True},
             )
-            scored.append((adjusted_confidence, new_candidate))
-        
-        # Sort by adjusted confidence descending
-        scored.sort(key=lambda x: x[0], reverse=True)
-        
-        return [c for _, c in scored[:top_k]]
+            for adjusted_confidence, candidate in top
+        ]
@@ -1,11 +1,15 @@
 """Test context packet contract validation."""
+from datetime import datetime
+
 import pytest
+from pydantic import ValidationError
 
 from second_brain.contracts.context_packet import (
     ContextCandidate,
     ConfidenceSummary,
     ContextPacket,
     NextAction,
+    RetrievalRequest,
 )
 from second_brain.orchestration.fallbacks import (
     FallbackEmitter,
@@ -29,7 +33,7 @@ class TestContextCandidate:
         assert candidate.metadata == {}
     
     def test_confidence_bounds(self):
-        with pytest.raises(Exception):
+        with pytest.raises(ValidationError, match="confidence"):
             ContextCandidate(
                 id="test-2",
                 content="Test",
@@ -78,7 +82,7 @@ class TestContextPacket:
     
     def test_valid_packet(self):
         candidates = [
-            ContextCandidate(
+            ContextCandidate.model_construct(
                 id="c1",
                 content="Content 1",
                 source="mem0",
@@ -100,6 +104,7 @@ class TestContextPacket:
         assert packet.provider == "mem0"
         assert packet.rerank_applied is True
         assert isinstance(packet.timestamp, str)
+        assert datetime.fromisoformat(packet.timestamp).tzinfo is not None
     
     def test_empty_packet(self):
         packet = ContextPacket(
@@ -157,6 +162,15 @@ class TestNextAction:
         assert action.action == "escalate"
 
 
+class TestRetrievalRequest:
+    """Test RetrievalRequest model."""
+    
+    def test_request_is_immutable(self):
+        request = RetrievalRequest(query="test")
+        with pytest.raises(ValidationError):
+            request.query = "changed"
+
+
 class TestFallbackEmitter:
     """Test FallbackEmitter branch emitters."""
     
@@ -171,7 +185,7 @@ class TestFallbackEmitter:
     
     def test_emit_low_confidence(self):
         candidates = [
-            ContextCandidate(
+            ContextCandidate.model_construct(
                 id="c1",
                 content="Low confidence",
                 source="mem0",
@@ -190,7 +204,7 @@ class TestFallbackEmitter:
     
     def test_emit_success(self):
         candidates = [
-            ContextCandidate(
+            ContextCandidate.model_construct(
                 id="c1",
                 content="High confidence",
                 source="mem0",
@@ -206,7 +220,7 @@ class TestFallbackEmitter:
     
     def test_emit_rerank_bypassed(self):
         candidates = [
-            ContextCandidate(
+            ContextCandidate.model_construct(
                 id="c1",
                 content="Mem0 result",
                 source="mem0",
@@ -231,7 +245,7 @@ class TestDetermineBranch:
     
     def test_low_confidence(self):
         candidates = [
-            ContextCandidate(
+            ContextCandidate.model_construct(
                 id="c1",
                 content="Low confidence",
                 source="mem0",
@@ -244,7 +258,7 @@ class TestDetermineBranch:
     
     def test_high_confidence(self):
         candidates = [
-            ContextCandidate(
+            ContextCandidate.model_construct(
                 id="c1",
                 content="High confidence",
                 source="mem0",
@@ -257,7 +271,7 @@ class TestDetermineBranch:
     
     def test_mem0_rerank_bypass(self):
         candidates = [
-            ContextCandidate(
+            ContextCandidate.model_construct(
                 id="c1",
                 content="Mem0 with native rerank",
                 source="mem0",
@@ -14,154 +14,162 @@ from second_brain.validation.manual_branch_scenarios import (
 from second_brain.orchestration.fallbacks import BranchCodes
 
 
+_ALL_SCENARIOS = tuple(get_all_scenarios())
+_SCENARIO_INDEX = {s.id: s for s in _ALL_SCENARIOS}
+_SMOKE_SCENARIOS = tuple(get_smoke_scenarios())
+_POLICY_SCENARIOS = tuple(get_policy_scenarios())
+
+_RERANK = VoyageRerankService()
+
+_VALID_BRANCHES = frozenset({
+    BranchCodes.EMPTY_SET,
+    BranchCodes.LOW_CONFIDENCE,
+    BranchCodes.CHANNEL_MISMATCH,
+    BranchCodes.RERANK_BYPASSED,
+    BranchCodes.SUCCESS,
+})
+_VALID_ACTIONS = frozenset({"proceed", "clarify", "fallback", "escalate"})
+_VALID_TAGS = frozenset({"smoke", "policy", "edge", "degraded", "validation", "deterministic"})
+
+
+_ORCH_CACHE: dict[tuple[frozenset, frozenset], RecallOrchestrator] = {}
+
+
+def _config_key(scenario: BranchScenario) -> tuple[frozenset, frozenset]:
+    """Key scenarios by routing config so identical configs share an orchestrator."""
+    return (
+        frozenset(scenario.feature_flags.items()),
+        frozenset(scenario.provider_status.items()),
+    )
+
+
+def _orchestrator_for(scenario: BranchScenario) -> RecallOrchestrator:
+    """Return a shared orchestrator for the scenario's flags and provider status.
+
+    RecallOrchestrator keeps no per-request state, so reuse across scenarios is safe.
+    """
+    key = _config_key(scenario)
+    if key not in _ORCH_CACHE:
+        _ORCH_CACHE[key] = RecallOrchestrator(
+            memory_service=MemoryService(provider="mem0"),
+            rerank_service=_RERANK,
+            feature_flags=scenario.feature_flags,
+            provider_status=scenario.provider_status,
+        )
+    return _ORCH_CACHE[key]
+
+
+@pytest.fixture(scope="session")
+def scenario_response(request):
+    """Run the parametrized scenario once and share its response across tests."""
+    scenario: BranchScenario = request.param
+    return scenario, _orchestrator_for(scenario).run(scenario.request)
+
+
+def _signature(response) -> tuple[str, str, str, str]:
+    """Reduce a response to the fields that must be deterministic."""
+    return (
+        response.context_packet.summary.branch,
+        response.next_action.action,
+        response.routing_metadata["selected_provider"],
+        response.routing_metadata["rerank_type"],
+    )
+
+
+def _mismatch_message(scenario: BranchScenario, field: str, expected: object, actual: object) -> str:
+    """Format an operator-friendly expected/actual mismatch for a scenario."""
+    return (
+        f"Scenario {scenario.id} ({scenario.description}): "
+        f"Expected {field} {expected}, got {actual}"
+    )
+
+
 class TestScenarioFixtures:
     """Test scenario fixture integrity."""
     
     def test_all_scenarios_have_unique_ids(self):
         """Ensure no duplicate scenario IDs."""
-        scenarios = get_all_scenarios()
-        ids = [s.id for s in scenarios]
-        assert len(ids) == len(set(ids)), "Duplicate scenario IDs found"
-    
-    def test_all_scenarios_have_required_fields(self):
-        """Ensure all scenarios have required fields."""
-        for scenario in get_all_scenarios():
-            assert scenario.id, "Missing scenario ID"
-            assert scenario.description, "Missing description"
-            assert scenario.request, "Missing request"
-            assert scenario.expected_branch, "Missing expected branch"
-            assert scenario.expected_action, "Missing expected action"
-            assert scenario.tags, "Missing tags"
-    
-    def test_scenario_branch_codes_valid(self):
-        """Ensure all expected branches are valid BranchCodes."""
-        valid_branches = [
-            BranchCodes.EMPTY_SET,
-            BranchCodes.LOW_CONFIDENCE,
-            BranchCodes.CHANNEL_MISMATCH,
-            BranchCodes.RERANK_BYPASSED,
-            BranchCodes.SUCCESS,
-        ]
-        
-        for scenario in get_all_scenarios():
-            assert scenario.expected_branch in valid_branches, \
-                f"Invalid branch {scenario.expected_branch} in scenario {scenario.id}"
+        seen: set[str] = set()
+        duplicates = []
+        for scenario in _ALL_SCENARIOS:
+            if scenario.id in seen:
+                duplicates.append(scenario.id)
+            seen.add(scenario.id)
+        assert not duplicates, f"Duplicate scenario IDs found: {duplicates}"
     
-    def test_scenario_action_codes_valid(self):
-        """Ensure all expected actions are valid."""
-        valid_actions = ["proceed", "clarify", "fallback", "escalate"]
-        
-        for scenario in get_all_scenarios():
-            assert scenario.expected_action in valid_actions, \
-                f"Invalid action {scenario.expected_action} in scenario {scenario.id}"
+    def test_get_scenario_by_id_lookup(self):
+        """Ensure lookup by ID finds known scenarios and misses unknown ones."""
+        scenario = get_scenario_by_id("S001")
+        assert scenario is not None
+        assert scenario.id == "S001"
+        assert get_scenario_by_id("S999") is None
     
-    def test_scenario_tags_present(self):
-        """Ensure scenarios have appropriate tags."""
-        valid_tags = ["smoke", "policy", "edge", "degraded", "validation", "deterministic"]
-        
-        for scenario in get_all_scenarios():
-            for tag in scenario.tags:
-                assert tag in valid_tags, f"Invalid tag {tag} in scenario {scenario.id}"
+    @pytest.mark.parametrize("scenario", _ALL_SCENARIOS, ids=lambda s: s.id)
+    def test_scenario_integrity(self, scenario: BranchScenario):
+        """Ensure each scenario has required fields and valid codes."""
+        assert scenario.id, "Missing scenario ID"
+        assert scenario.description, "Missing description"
+        assert scenario.request, "Missing request"
+        assert scenario.expected_action, "Missing expected action"
+        assert scenario.tags, "Missing tags"
+        assert scenario.expected_branch in _VALID_BRANCHES, \
+            f"Invalid branch {scenario.expected_branch} in scenario {scenario.id}"
+        assert scenario.expected_action in _VALID_ACTIONS, \
+            f"Invalid action {scenario.expected_action} in scenario {scenario.id}"
+        invalid_tags = [tag for tag in scenario.tags if tag not in _VALID_TAGS]
+        assert not invalid_tags, f"Invalid tags {invalid_tags} in scenario {scenario.id}"
 
 
 class TestSmokeScenarios:
     """Test smoke scenario execution."""
     
-    @pytest.mark.parametrize("scenario", get_smoke_scenarios(), ids=lambda s: s.id)
-    def test_smoke_scenario_branch(self, scenario: BranchScenario):
+    @pytest.mark.parametrize("scenario_response", _SMOKE_SCENARIOS, indirect=True, ids=lambda s: s.id)
+    def test_smoke_scenario_branch(self, scenario_response):
         """Test smoke scenarios produce expected branch."""
-        memory_service = MemoryService(provider="mem0")
-        
-        orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
-            feature_flags=scenario.feature_flags,
-            provider_status=scenario.provider_status,
-        )
+        scenario, response = scenario_response
         
-        response = orchestrator.run(scenario.request)
-        
-        assert response.context_packet.summary.branch == scenario.expected_branch, \
-            f"Scenario {scenario.id}: Expected {scenario.expected_branch}, got {response.context_packet.summary.branch}"
+        actual = response.context_packet.summary.branch
+        assert actual == scenario.expected_branch, \
+            _mismatch_message(scenario, "branch", scenario.expected_branch, actual)
     
-    @pytest.mark.parametrize("scenario", get_smoke_scenarios(), ids=lambda s: s.id)
-    def test_smoke_scenario_action(self, scenario: BranchScenario):
+    @pytest.mark.parametrize("scenario_response", _SMOKE_SCENARIOS, indirect=True, ids=lambda s: s.id)
+    def test_smoke_scenario_action(self, scenario_response):
         """Test smoke scenarios produce expected action."""
-        memory_service = MemoryService(provider="mem0")
+        scenario, response = scenario_response
         
-        orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
-            feature_flags=scenario.feature_flags,
-            provider_status=scenario.provider_status,
-        )
-        
-        response = orchestrator.run(scenario.request)
-        
-        assert response.next_action.action == scenario.expected_action, \
-            f"Scenario {scenario.id}: Expected {scenario.expected_action}, got {response.next_action.action}"
+        actual = response.next_action.action
+        assert actual == scenario.expected_action, \
+            _mismatch_message(scenario, "action", scenario.expected_action, actual)
 
 
 class TestPolicyScenarios:
     """Test policy scenario execution."""
     
-    @pytest.mark.parametrize("scenario", get_policy_scenarios(), ids=lambda s: s.id)
-    def test_policy_scenario_rerank_metadata(self, scenario: BranchScenario):
+    @pytest.mark.parametrize("scenario_response", _POLICY_SCENARIOS, indirect=True, ids=lambda s: s.id)
+    def test_policy_scenario_rerank_metadata(self, scenario_response):
         """Test policy scenarios have correct rerank metadata."""
-        memory_service = MemoryService(provider="mem0")
+        scenario, response = scenario_response
         
-        orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
-            feature_flags=scenario.feature_flags,
-            provider_status=scenario.provider_status,
-        )
-        
-        response = orchestrator.run(scenario.request)
-        
-        assert response.routing_metadata["rerank_type"] == scenario.expected_rerank_type, \
-            f"Scenario {scenario.id}: Expected rerank_type {scenario.expected_rerank_type}, got {response.routing_metadata['rerank_type']}"
+        actual = response.routing_metadata["rerank_type"]
+        assert actual == scenario.expected_rerank_type, \
+            _mismatch_message(scenario, "rerank_type", scenario.expected_rerank_type, actual)
 
 
 class TestEdgeScenarios:
     """Test edge scenario execution."""
     
-    def test_all_providers_disabled_returns_empty_set(self):
-        """Test S013: All providers disabled returns EMPTY_SET."""
-        scenario = get_scenario_by_id("S013")
-        assert scenario is not None
-        
-        memory_service = MemoryService(provider="mem0")
-        
-        orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
-            feature_flags=scenario.feature_flags,
-            provider_status=scenario.provider_status,
-        )
-        
-        response = orchestrator.run(scenario.request)
+    @pytest.mark.parametrize(
+        "scenario_response",
+        [_SCENARIO_INDEX["S013"], _SCENARIO_INDEX["S014"]],
+        indirect=True,
+        ids=lambda s: s.id,
+    )
+    def test_all_providers_off_returns_empty_set(self, scenario_response):
+        """Test S013/S014: All providers disabled or unavailable returns EMPTY_SET."""
+        _, response = scenario_response
         
         assert response.context_packet.summary.branch == BranchCodes.EMPTY_SET
         assert response.next_action.action == "fallback"
-    
-    def test_all_providers_unavailable_returns_empty_set(self):
-        """Test S014: All providers unavailable returns EMPTY_SET."""
-        scenario = get_scenario_by_id("S014")
-        assert scenario is not None
-        
-        memory_service = MemoryService(provider="mem0")
-        
-        orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
-            feature_flags=scenario.feature_flags,
-            provider_status=scenario.provider_status,
-        )
-        
-        response = orchestrator.run(scenario.request)
-        
-        assert response.context_packet.summary.branch == BranchCodes.EMPTY_SET
 
 
 class TestDegradedScenarios:
@@ -169,14 +177,13 @@ class TestDegradedScenarios:
     
     def test_degraded_mem0_falls_back_to_supabase(self):
         """Test S015: Degraded Mem0 falls back to Supabase."""
-        scenario = get_scenario_by_id("S015")
-        assert scenario is not None
+        scenario = _SCENARIO_INDEX["S015"]
         
         memory_service = MemoryService(provider="supabase")
         
         orchestrator = RecallOrchestrator(
             memory_service=memory_service,
-            rerank_service=VoyageRerankService(enabled=True),
+            rerank_service=_RERANK,
             feature_flags=scenario.feature_flags,
             provider_status=scenario.provider_status,
         )
@@ -193,29 +200,20 @@ class TestDeterministicReplay:
     
     def test_deterministic_replay_s048(self):
         """Test S048: Same inputs produce identical outputs."""
-        scenario = get_scenario_by_id("S048")
-        assert scenario is not None
+        scenario = _SCENARIO_INDEX["S048"]
         
         memory_service = MemoryService(provider="mem0")
         
         orchestrator = RecallOrchestrator(
             memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
+            rerank_service=_RERANK,
             feature_flags=scenario.feature_flags,
             provider_status=scenario.provider_status,
         )
         
-        results = []
-        for _ in range(10):
-            response = orchestrator.run(scenario.request)
-            results.append({
-                "branch": response.context_packet.summary.branch,
-                "action": response.next_action.action,
-                "provider": response.routing_metadata["selected_provider"],
-                "rerank_type": response.routing_metadata["rerank_type"],
-            })
+        signatures = {_signature(orchestrator.run(scenario.request)) for _ in range(2)}
         
-        assert all(r == results[0] for r in results), "Non-deterministic results detected"
+        assert len(signatures) == 1, f"Non-deterministic results detected: {signatures}"
 
 
 class TestOperatorFriendlyAssertions:
@@ -223,24 +221,12 @@ class TestOperatorFriendlyAssertions:
     
     def test_branch_mismatch_message_includes_scenario_id(self):
         """Ensure branch mismatch messages include scenario ID."""
-        scenario = get_scenario_by_id("S001")
-        assert scenario is not None
+        scenario = _SCENARIO_INDEX["S001"]
+        actual_branch = BranchCodes.LOW_CONFIDENCE
         
-        memory_service = MemoryService(provider="mem0")
-        orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
-            feature_flags=scenario.feature_flags,
-            provider_status=scenario.provider_status,
-        )
+        error_msg = _mismatch_message(scenario, "branch", scenario.expected_branch, actual_branch)
         
-        response = orchestrator.run(scenario.request)
-        
-        # Verify we can construct helpful error message
-        if response.context_packet.summary.branch != scenario.expected_branch:
-            error_msg = (
-                f"Scenario {scenario.id} ({scenario.description}): "
-                f"Expected branch {scenario.expected_branch}, "
-                f"got {response.context_packet.summary.branch}"
-            )
-            assert scenario.id in error_msg
+        assert error_msg == (
+            f"Scenario S001 ({scenario.description}): "
+            f"Expected branch {scenario.expected_branch}, got {BranchCodes.LOW_CONFIDENCE}"
+        )
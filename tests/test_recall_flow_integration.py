@@ -1,4 +1,5 @@
 """Integration tests for recall flow with all branch paths."""
+import pytest
 
 from second_brain.contracts.context_packet import RetrievalRequest
 from second_brain.orchestration.fallbacks import BranchCodes
@@ -7,13 +8,48 @@ from second_brain.services.memory import MemoryService, MemorySearchResult
 from second_brain.services.voyage import VoyageRerankService
 
 
+# VoyageRerankService holds only config, so one instance per setting is shared
+_RERANK = VoyageRerankService()
+_RERANK_DISABLED = VoyageRerankService(enabled=False)
+
+_REQUIRED_METADATA_FIELDS = frozenset({
+    "selected_provider",
+    "mode",
+    "skip_external_rerank",
+    "rerank_type",
+    "feature_flags_snapshot",
+})
+
+_TEST_REQUEST = RetrievalRequest(query="test", mode="conversation")
+
+_EMPTY_RESULTS: tuple[MemorySearchResult, ...] = ()
+_LOW_CONF_RESULTS = (
+    MemorySearchResult(
+        id="low-1",
+        content="Low confidence result",
+        source="mem0",
+        confidence=0.45,
+        metadata={},
+    ),
+)
+
+
+@pytest.fixture(scope="module")
+def mem0_orchestrator():
+    """Default-config Mem0 orchestrator shared by tests that don't mutate services."""
+    return RecallOrchestrator(
+        memory_service=MemoryService(provider="mem0"),
+        rerank_service=_RERANK,
+    )
+
+
 class TestRecallFlowIntegration:
     """Integration tests for full recall runtime path."""
     
     def test_success_branch_mem0(self):
         """Test SUCCESS branch with Mem0 provider."""
         memory_service = MemoryService(provider="mem0")
-        rerank_service = VoyageRerankService(enabled=False)  # Mem0 skips external
+        rerank_service = _RERANK_DISABLED  # Mem0 skips external
         
         orchestrator = RecallOrchestrator(
             memory_service=memory_service,
@@ -30,19 +66,20 @@ class TestRecallFlowIntegration:
         
         response = orchestrator.run(request)
         
+        meta = response.routing_metadata
         assert response.context_packet.summary.branch == BranchCodes.RERANK_BYPASSED
         assert response.next_action.action == "proceed"
-        assert response.routing_metadata["selected_provider"] == "mem0"
-        assert response.routing_metadata["rerank_type"] == "provider-native"
+        assert meta["selected_provider"] == "mem0"
+        assert meta["rerank_type"] == "provider-native"
     
     def test_empty_set_branch(self):
         """Test EMPTY_SET branch with no candidates."""
         memory_service = MemoryService(provider="mem0")
-        memory_service.set_mock_data([])
+        memory_service.set_mock_data(_EMPTY_RESULTS)
         
         orchestrator = RecallOrchestrator(
             memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
+            rerank_service=_RERANK,
         )
         
         request = RetrievalRequest(
@@ -59,19 +96,11 @@ class TestRecallFlowIntegration:
     def test_low_confidence_branch(self):
         """Test LOW_CONFIDENCE branch."""
         memory_service = MemoryService(provider="mem0")
-        memory_service.set_mock_data([
-            MemorySearchResult(
-                id="low-1",
-                content="Low confidence result",
-                source="mem0",
-                confidence=0.45,
-                metadata={},
-            ),
-        ])
+        memory_service.set_mock_data(_LOW_CONF_RESULTS)
         
         orchestrator = RecallOrchestrator(
             memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
+            rerank_service=_RERANK,
         )
         
         request = RetrievalRequest(
@@ -89,7 +118,7 @@ class TestRecallFlowIntegration:
     def test_mem0_policy_skip_external_rerank(self):
         """Test Mem0 path skips external rerank by default."""
         memory_service = MemoryService(provider="mem0")
-        rerank_service = VoyageRerankService(enabled=True)
+        rerank_service = _RERANK
         
         orchestrator = RecallOrchestrator(
             memory_service=memory_service,
@@ -104,14 +133,15 @@ class TestRecallFlowIntegration:
         
         response = orchestrator.run(request)
         
-        assert response.routing_metadata["skip_external_rerank"] is True
-        assert response.routing_metadata["rerank_type"] == "provider-native"
-        assert response.routing_metadata["rerank_bypass_reason"] == "mem0-default-policy"
+        meta = response.routing_metadata
+        assert meta["skip_external_rerank"] is True
+        assert meta["rerank_type"] == "provider-native"
+        assert meta["rerank_bypass_reason"] == "mem0-default-policy"
     
     def test_non_mem0_allows_external_rerank(self):
         """Test non-Mem0 path allows external rerank."""
         memory_service = MemoryService(provider="supabase")
-        rerank_service = VoyageRerankService(enabled=True)
+        rerank_service = _RERANK
         
         orchestrator = RecallOrchestrator(
             memory_service=memory_service,
@@ -127,136 +157,133 @@ class TestRecallFlowIntegration:
         
         response = orchestrator.run(request)
         
-        assert response.routing_metadata["skip_external_rerank"] is False
-        assert response.routing_metadata["rerank_type"] == "external"
+        meta = response.routing_metadata
+        assert meta["skip_external_rerank"] is False
+        assert meta["rerank_type"] == "external"
     
-    def test_routing_metadata_complete(self):
+    def test_routing_metadata_complete(self, mem0_orchestrator):
         """Test all required routing metadata fields present."""
-        memory_service = MemoryService(provider="mem0")
-        
-        orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
-        )
-        
         request = RetrievalRequest(
             query="metadata test",
             mode="conversation",
         )
         
-        response = orchestrator.run(request)
-        
-        required_fields = [
-            "selected_provider",
-            "mode",
-            "skip_external_rerank",
-            "rerank_type",
-            "feature_flags_snapshot",
-        ]
+        response = mem0_orchestrator.run(request)
         
-        for field in required_fields:
-            assert field in response.routing_metadata, f"Missing field: {field}"
+        missing = _REQUIRED_METADATA_FIELDS - response.routing_metadata.keys()
+        assert not missing, f"Missing fields: {missing}"
     
-    def test_deterministic_repeated_runs(self):
-        """Test same inputs produce identical outputs across runs."""
-        memory_service = MemoryService(provider="mem0")
+    def test_metadata_snapshots_not_shared_across_runs(self, mem0_orchestrator):
+        """Mutating one response's snapshots must not leak into later runs."""
+        first = mem0_orchestrator.run(_TEST_REQUEST)
+        first.routing_metadata["feature_flags_snapshot"]["mem0_enabled"] = False
+        first.routing_metadata["provider_status_snapshot"]["mem0"] = "unavailable"
         
-        orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
-        )
+        second = mem0_orchestrator.run(_TEST_REQUEST)
         
+        assert second.routing_metadata["feature_flags_snapshot"]["mem0_enabled"] is True
+        assert second.routing_metadata["provider_status_snapshot"]["mem0"] == "available"
+    
+    def test_deterministic_repeated_runs(self, mem0_orchestrator):
+        """Test same inputs produce identical outputs across runs."""
         request = RetrievalRequest(
             query="deterministic test",
             mode="conversation",
         )
         
-        results = []
-        for _ in range(5):
-            response = orchestrator.run(request)
-            results.append({
-                "branch": response.context_packet.summary.branch,
-                "action": response.next_action.action,
-                "provider": response.routing_metadata["selected_provider"],
-                "rerank_type": response.routing_metadata["rerank_type"],
-            })
-        
-        # All results must be identical
-        assert all(r == results[0] for r in results)
+        def signature():
+            response = mem0_orchestrator.run(request)
+            return (
+                response.context_packet.summary.branch,
+                response.next_action.action,
+                response.routing_metadata["selected_provider"],
+                response.routing_metadata["rerank_type"],
+            )
+        
+        # Deterministic code diverges on the second run if at all
+        signatures = {signature() for _ in range(2)}
+        assert len(signatures) == 1, f"Non-deterministic results detected: {signatures}"
 
 
-class TestValidationModeForcedBranches:
-    """Test validation mode with forced branches."""
+class TestMemoryServiceFallback:
+    """Test the cached deterministic fallback path."""
     
-    def test_force_empty_set(self):
-        """Force EMPTY_SET branch in validation mode."""
+    def test_fallback_results_do_not_share_metadata(self):
+        """Mutating a fallback result must not corrupt later searches."""
         memory_service = MemoryService(provider="mem0")
         
-        orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
-        )
+        first = memory_service._search_fallback("fallback cache test", 5, 0.6)
+        first[0].metadata["mock"] = False
+        second = memory_service._search_fallback("fallback cache test", 5, 0.6)
         
-        request = RetrievalRequest(query="test", mode="conversation")
-        response = orchestrator.run(
-            request,
-            validation_mode=True,
-            force_branch=BranchCodes.EMPTY_SET,
-        )
-        
-        assert response.context_packet.summary.branch == BranchCodes.EMPTY_SET
-        assert response.next_action.action == "fallback"
-        assert response.routing_metadata.get("validation_mode") is True
+        assert second[0].metadata["mock"] is True
+        assert second[0].metadata is not first[0].metadata
+
+
+class TestValidationModeForcedBranches:
+    """Test validation mode with forced branches."""
     
-    def test_force_low_confidence(self):
-        """Force LOW_CONFIDENCE branch in validation mode."""
-        memory_service = MemoryService(provider="mem0")
-        
-        orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
-        )
-        
-        request = RetrievalRequest(query="test", mode="conversation")
-        response = orchestrator.run(
-            request,
+    @pytest.mark.parametrize(
+        "branch,action",
+        [
+            (BranchCodes.EMPTY_SET, "fallback"),
+            (BranchCodes.LOW_CONFIDENCE, "clarify"),
+            (BranchCodes.CHANNEL_MISMATCH, "escalate"),
+        ],
+    )
+    def test_force_branch(self, mem0_orchestrator, branch, action):
+        """Force a specific branch in validation mode."""
+        response = mem0_orchestrator.run(
+            _TEST_REQUEST,
             validation_mode=True,
-            force_branch=BranchCodes.LOW_CONFIDENCE,
+            force_branch=branch,
         )
         
-        assert response.context_packet.summary.branch == BranchCodes.LOW_CONFIDENCE
-        assert response.next_action.action == "clarify"
+        assert response.context_packet.summary.branch == branch
+        assert response.next_action.action == action
+        assert response.routing_metadata.get("validation_mode") is True
     
-    def test_force_channel_mismatch(self):
-        """Force CHANNEL_MISMATCH branch in validation mode."""
-        memory_service = MemoryService(provider="mem0")
+    @pytest.mark.parametrize(
+        "provider,feature_flags,provider_status,expected_rerank_type",
+        [
+            ("mem0", None, None, "provider-native"),
+            # No candidates are retrieved, so the external rerank never runs
+            (
+                "supabase",
+                {"mem0_enabled": False, "supabase_enabled": True},
+                {"mem0": "unavailable", "supabase": "available"},
+                "none",
+            ),
+        ],
+    )
+    def test_force_empty_set_skips_retrieval(
+        self, provider, feature_flags, provider_status, expected_rerank_type
+    ):
+        """Forced EMPTY_SET must not hit the memory provider."""
+        class NoSearchMemoryService(MemoryService):
+            def search_memories(self, *args, **kwargs):
+                raise AssertionError("search_memories should not be called")
         
         orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
+            memory_service=NoSearchMemoryService(provider=provider),
+            rerank_service=_RERANK,
+            feature_flags=feature_flags,
+            provider_status=provider_status,
         )
-        
-        request = RetrievalRequest(query="test", mode="conversation")
         response = orchestrator.run(
-            request,
+            _TEST_REQUEST,
             validation_mode=True,
-            force_branch=BranchCodes.CHANNEL_MISMATCH,
+            force_branch=BranchCodes.EMPTY_SET,
         )
         
-        assert response.context_packet.summary.branch == BranchCodes.CHANNEL_MISMATCH
-        assert response.next_action.action == "escalate"
+        assert response.context_packet.summary.branch == BranchCodes.EMPTY_SET
+        assert response.context_packet.candidates == []
+        assert response.routing_metadata["selected_provider"] == provider
+        assert response.routing_metadata["rerank_type"] == expected_rerank_type
     
-    def test_validation_mode_disabled_by_default(self):
+    def test_validation_mode_disabled_by_default(self, mem0_orchestrator):
         """Test validation mode is disabled by default."""
-        memory_service = MemoryService(provider="mem0")
-        
-        orchestrator = RecallOrchestrator(
-            memory_service=memory_service,
-            rerank_service=VoyageRerankService(),
-        )
-        
-        request = RetrievalRequest(query="test", mode="conversation")
-        response = orchestrator.run(request)  # No validation_mode
+        response = mem0_orchestrator.run(_TEST_REQUEST)  # No validation_mode
         
         assert response.routing_metadata.get("validation_mode") is None
 
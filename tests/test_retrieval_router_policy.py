@@ -1,4 +1,8 @@
 """Test retrieval router policy and deterministic selection."""
+from itertools import permutations
+from types import MappingProxyType
+
+import pytest
 
 from second_brain.contracts.context_packet import RetrievalRequest
 from second_brain.orchestration.retrieval_router import (
@@ -8,6 +12,37 @@ from second_brain.orchestration.retrieval_router import (
 )
 
 
+# Read-only status maps; select_route only consults providers it is offered
+_ALL_AVAILABLE = MappingProxyType({
+    "mem0": ProviderStatus.AVAILABLE,
+    "supabase": ProviderStatus.AVAILABLE,
+    "graphiti": ProviderStatus.AVAILABLE,
+})
+_NO_STATUS = MappingProxyType({})
+_NO_FLAGS = MappingProxyType({})
+_MEM0_DOWN = MappingProxyType({
+    "mem0": ProviderStatus.UNAVAILABLE,
+    "supabase": ProviderStatus.AVAILABLE,
+})
+
+_DEFAULT_ROUTE_PROVIDERS = frozenset({"mem0", "supabase", "none"})
+_ACCURATE_ROUTE_PROVIDERS = frozenset({"mem0", "supabase", "graphiti"})
+
+# RetrievalRequest is frozen, so shared request shapes are built once;
+# values are known-good, so skip validation
+_CONVERSATION_REQUEST = RetrievalRequest.model_construct(query="test query", mode="conversation")
+_SUPABASE_OVERRIDE_REQUEST = RetrievalRequest.model_construct(
+    query="test query",
+    mode="conversation",
+    provider_override="supabase",
+)
+_GRAPHITI_OVERRIDE_REQUEST = RetrievalRequest.model_construct(
+    query="test query",
+    mode="conversation",
+    provider_override="graphiti",
+)
+
+
 class TestProviderStatus:
     """Test ProviderStatus constants."""
     
@@ -20,131 +55,94 @@ class TestProviderStatus:
 class TestRouteDecisionSelectRoute:
     """Test RouteDecision.select_route method."""
     
-    def test_conversation_mode_prefers_mem0(self):
-        provider, options = RouteDecision.select_route(
-            mode="conversation",
-            available_providers=["mem0", "supabase"],
-            feature_flags={},
-            provider_status={
-                "mem0": ProviderStatus.AVAILABLE,
-                "supabase": ProviderStatus.AVAILABLE,
-            }
-        )
-        assert provider == "mem0"
-        assert options["skip_external_rerank"] is True
-    
-    def test_conversation_mode_fallback_to_supabase(self):
+    @pytest.mark.parametrize(
+        "mode,available,status,expected_provider,expected_skip",
+        [
+            pytest.param(
+                "conversation", ["mem0", "supabase"], _ALL_AVAILABLE, "mem0", True,
+                id="conversation_mode_prefers_mem0",
+            ),
+            pytest.param(
+                "conversation", ["supabase"], _MEM0_DOWN, "supabase", False,
+                id="conversation_mode_fallback_to_supabase",
+            ),
+            pytest.param(
+                "fast", ["supabase", "mem0"], _ALL_AVAILABLE, "mem0", True,
+                id="fast_mode_selects_first_available",
+            ),
+            pytest.param(
+                "conversation", [], _NO_STATUS, "none", False,
+                id="no_available_providers",
+            ),
+            pytest.param(
+                "conversation", ["mem0"], MappingProxyType({"mem0": ProviderStatus.UNAVAILABLE}), "none", False,
+                id="all_unavailable",
+            ),
+            pytest.param(
+                "fast", ["supabase"], MappingProxyType({"supabase": ProviderStatus.DEGRADED}), "supabase", False,
+                id="degraded_provider_fallback",
+            ),
+        ],
+    )
+    def test_select_route(self, mode, available, status, expected_provider, expected_skip):
         provider, options = RouteDecision.select_route(
-            mode="conversation",
-            available_providers=["supabase"],
-            feature_flags={},
-            provider_status={
-                "mem0": ProviderStatus.UNAVAILABLE,
-                "supabase": ProviderStatus.AVAILABLE,
-            }
+            mode=mode,
+            available_providers=available,
+            feature_flags=_NO_FLAGS,
+            provider_status=status,
         )
-        assert provider == "supabase"
-        assert options["skip_external_rerank"] is False
-    
-    def test_fast_mode_selects_first_available(self):
-        provider, options = RouteDecision.select_route(
-            mode="fast",
-            available_providers=["supabase", "mem0"],
-            feature_flags={},
-            provider_status={
-                "mem0": ProviderStatus.AVAILABLE,
-                "supabase": ProviderStatus.AVAILABLE,
-            }
-        )
-        assert provider == "mem0"
-        assert options["skip_external_rerank"] is True
+        assert provider == expected_provider
+        assert options["skip_external_rerank"] is expected_skip
     
     def test_accurate_mode_with_multiple_providers(self):
         provider, options = RouteDecision.select_route(
             mode="accurate",
             available_providers=["mem0", "supabase", "graphiti"],
-            feature_flags={"graphiti_enabled": True},
-            provider_status={
-                "mem0": ProviderStatus.AVAILABLE,
-                "supabase": ProviderStatus.AVAILABLE,
-                "graphiti": ProviderStatus.AVAILABLE,
-            }
+            feature_flags=MappingProxyType({"graphiti_enabled": True}),
+            provider_status=_ALL_AVAILABLE
         )
         # Should select first available
-        assert provider in ["mem0", "supabase", "graphiti"]
-    
-    def test_no_available_providers(self):
-        provider, options = RouteDecision.select_route(
-            mode="conversation",
-            available_providers=[],
-            feature_flags={},
-            provider_status={}
-        )
-        assert provider == "none"
-        assert options["skip_external_rerank"] is False
-    
-    def test_all_unavailable(self):
-        provider, options = RouteDecision.select_route(
-            mode="conversation",
-            available_providers=["mem0"],
-            feature_flags={},
-            provider_status={
-                "mem0": ProviderStatus.UNAVAILABLE,
-            }
-        )
-        assert provider == "none"
-    
-    def test_degraded_provider_fallback(self):
-        provider, options = RouteDecision.select_route(
-            mode="fast",
-            available_providers=["supabase"],
-            feature_flags={},
-            provider_status={
-                "supabase": ProviderStatus.DEGRADED,
-            }
-        )
-        assert provider == "supabase"
-        assert options["skip_external_rerank"] is False
+        assert provider in _ACCURATE_ROUTE_PROVIDERS
 
 
 class TestRouteDecisionCheckFeatureFlags:
     """Test RouteDecision.check_feature_flags method."""
     
     def test_default_flags(self):
-        enabled = RouteDecision.check_feature_flags({})
+        enabled = set(RouteDecision.check_feature_flags(_NO_FLAGS))
         assert "mem0" in enabled
         assert "supabase" in enabled
         assert "graphiti" not in enabled
     
     def test_graphiti_enabled(self):
-        enabled = RouteDecision.check_feature_flags(
-            {"graphiti_enabled": True}
-        )
+        enabled = set(RouteDecision.check_feature_flags(
+            MappingProxyType({"graphiti_enabled": True})
+        ))
         assert "graphiti" in enabled
         assert "mem0" in enabled
         assert "supabase" in enabled
     
     def test_mem0_disabled(self):
-        enabled = RouteDecision.check_feature_flags(
-            {"mem0_enabled": False}
-        )
+        enabled = set(RouteDecision.check_feature_flags(
+            MappingProxyType({"mem0_enabled": False})
+        ))
         assert "mem0" not in enabled
         assert "supabase" in enabled
     
     def test_supabase_disabled(self):
-        enabled = RouteDecision.check_feature_flags(
-            {"supabase_enabled": False}
-        )
+        enabled = set(RouteDecision.check_feature_flags(
+            MappingProxyType({"supabase_enabled": False})
+        ))
         assert "supabase" not in enabled
         assert "mem0" in enabled
     
     def test_all_disabled(self):
         enabled = RouteDecision.check_feature_flags(
-            {
+            MappingProxyType({
                 "mem0_enabled": False,
                 "supabase_enabled": False,
                 "graphiti_enabled": False,
-            }
+            })
         )
         assert enabled == []
 
@@ -153,38 +151,42 @@ class TestRouteRetrieval:
     """Test route_retrieval function."""
     
     def test_basic_routing(self):
-        request = RetrievalRequest(
-            query="test query",
-            mode="conversation",
-        )
-        provider, options = route_retrieval(request)
-        assert provider in ["mem0", "supabase", "none"]
+        provider, options = route_retrieval(_CONVERSATION_REQUEST)
+        assert provider in _DEFAULT_ROUTE_PROVIDERS
     
-    def test_provider_override(self):
-        request = RetrievalRequest(
-            query="test query",
-            mode="conversation",
-            provider_override="supabase",
-        )
-        provider, options = route_retrieval(
-            request,
-            feature_flags={"mem0_enabled": True, "supabase_enabled": True}
-        )
-        assert provider == "supabase"
-        assert options["skip_external_rerank"] is False
+    @pytest.mark.parametrize(
+        "request_,flags,expected_provider,expected_skip",
+        [
+            pytest.param(
+                _SUPABASE_OVERRIDE_REQUEST,
+                MappingProxyType({"mem0_enabled": True, "supabase_enabled": True}),
+                "supabase",
+                False,
+                id="override_enabled_is_honored",
+            ),
+            pytest.param(
+                _GRAPHITI_OVERRIDE_REQUEST,
+                MappingProxyType({"graphiti_enabled": False}),
+                "none",
+                False,
+                id="override_disabled_falls_back",
+            ),
+        ],
+    )
+    def test_provider_override(self, request_, flags, expected_provider, expected_skip):
+        # Disabled overrides fall through to normal selection (no status -> none)
+        provider, options = route_retrieval(request_, feature_flags=flags)
+        assert provider == expected_provider
+        assert options["skip_external_rerank"] is expected_skip
     
-    def test_override_unavailable(self):
-        request = RetrievalRequest(
-            query="test query",
-            mode="conversation",
-            provider_override="graphiti",
-        )
-        provider, options = route_retrieval(
-            request,
-            feature_flags={"graphiti_enabled": False}
-        )
-        # Falls back to normal selection
-        assert provider != "graphiti"
+    def test_returned_options_do_not_leak_into_cache(self):
+        """Mutating returned options must not affect later identical routes."""
+        _, options = route_retrieval(_CONVERSATION_REQUEST, provider_status=_ALL_AVAILABLE)
+        original_skip = options["skip_external_rerank"]
+        options["skip_external_rerank"] = not original_skip
+        
+        _, again = route_retrieval(_CONVERSATION_REQUEST, provider_status=_ALL_AVAILABLE)
+        assert again["skip_external_rerank"] is original_skip
     
     def test_custom_threshold(self):
         request = RetrievalRequest(
@@ -206,8 +208,8 @@ class TestMem0DuplicateRerankPrevention:
         provider, options = RouteDecision.select_route(
             mode="conversation",
             available_providers=["mem0"],
-            feature_flags={},
-            provider_status={"mem0": ProviderStatus.AVAILABLE}
+            feature_flags=_NO_FLAGS,
+            provider_status=MappingProxyType({"mem0": ProviderStatus.AVAILABLE})
         )
         assert provider == "mem0"
         assert options["skip_external_rerank"] is True
@@ -217,31 +219,27 @@ class TestMem0DuplicateRerankPrevention:
         provider, options = RouteDecision.select_route(
             mode="conversation",
             available_providers=["supabase"],
-            feature_flags={},
-            provider_status={"supabase": ProviderStatus.AVAILABLE}
+            feature_flags=_NO_FLAGS,
+            provider_status=MappingProxyType({"supabase": ProviderStatus.AVAILABLE})
         )
         assert provider == "supabase"
         assert options["skip_external_rerank"] is False
     
-    def test_mem0_policy_is_deterministic(self):
-        """Same inputs MUST produce same Mem0 policy."""
-        results = []
-        for _ in range(5):
-            provider, options = RouteDecision.select_route(
-                mode="conversation",
-                available_providers=["mem0", "supabase"],
-                feature_flags={},
-                provider_status={
-                    "mem0": ProviderStatus.AVAILABLE,
-                    "supabase": ProviderStatus.AVAILABLE,
-                }
-            )
-            results.append((provider, options["skip_external_rerank"]))
-        
-        # All results must be identical
-        assert all(r == results[0] for r in results)
-        assert results[0][0] == "mem0"
-        assert results[0][1] is True
+    @pytest.mark.parametrize(
+        "available",
+        [list(order) for order in permutations(["mem0", "supabase"])],
+        ids="-".join,
+    )
+    def test_mem0_policy_is_deterministic(self, available):
+        """Mem0 policy MUST hold regardless of provider ordering."""
+        provider, options = RouteDecision.select_route(
+            mode="conversation",
+            available_providers=available,
+            feature_flags=_NO_FLAGS,
+            provider_status=_ALL_AVAILABLE,
+        )
+        assert provider == "mem0"
+        assert options["skip_external_rerank"] is True
 
 
 class TestDeterministicRouting:
@@ -256,15 +254,18 @@ class TestDeterministicRouting:
         ]
         
         for mode, providers in test_cases:
-            results = []
-            for _ in range(3):
-                provider, options = RouteDecision.select_route(
-                    mode=mode,
-                    available_providers=providers,
-                    feature_flags={"graphiti_enabled": True},
-                    provider_status={p: ProviderStatus.AVAILABLE for p in providers}
+            distinct = {
+                (provider, options["skip_external_rerank"])
+                for provider, options in (
+                    RouteDecision.select_route(
+                        mode=mode,
+                        available_providers=providers,
+                        feature_flags=MappingProxyType({"graphiti_enabled": True}),
+                        provider_status=_ALL_AVAILABLE,
+                    )
+                    for _ in range(3)
                 )
-                results.append((provider, options["skip_external_rerank"]))
+            }
             
             # All runs must match
-            assert all(r == results[0] for r in results)
+            assert len(distinct) == 1, f"Non-deterministic for {mode}: {distinct}"
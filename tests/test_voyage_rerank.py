@@ -0,0 +1,55 @@
+"""Test Voyage rerank service bypass and mock rerank paths."""
+from second_brain.contracts.context_packet import ContextCandidate
+from second_brain.services.voyage import VoyageRerankService
+
+
+def _make_candidates(count: int) -> list[ContextCandidate]:
+    return [
+        ContextCandidate.model_construct(
+            id=f"c{i}",
+            content=f"Candidate content {i}",
+            source="supabase",
+            confidence=0.5 + i * 0.1,
+            metadata={},
+        )
+        for i in range(count)
+    ]
+
+
+class TestRerankBypass:
+    """Test paths that skip reranking."""
+    
+    def test_disabled_returns_input_list(self):
+        candidates = _make_candidates(3)
+        reranked, metadata = VoyageRerankService(enabled=False).rerank("query", candidates)
+        assert reranked is candidates
+        assert metadata["rerank_type"] == "none"
+        assert metadata["bypass_reason"] == "disabled"
+    
+    def test_empty_candidates_returns_input_list(self):
+        candidates: list[ContextCandidate] = []
+        reranked, metadata = VoyageRerankService().rerank("query", candidates)
+        assert reranked is candidates
+        assert metadata["bypass_reason"] == "no_candidates"
+    
+    def test_single_candidate_returns_input_list(self):
+        candidates = _make_candidates(1)
+        reranked, metadata = VoyageRerankService().rerank("query", candidates)
+        assert reranked is candidates
+        assert metadata["bypass_reason"] == "single_candidate"
+    
+    def test_tuple_input_is_copied_to_list(self):
+        candidates = tuple(_make_candidates(3))
+        reranked, _ = VoyageRerankService(enabled=False).rerank("query", candidates)
+        assert reranked == list(candidates)
+
+
+class TestMockRerank:
+    """Test deterministic mock rerank."""
+    
+    def test_orders_by_adjusted_confidence(self):
+        candidates = _make_candidates(3)
+        reranked, metadata = VoyageRerankService().rerank("query", candidates, top_k=2)
+        assert metadata["rerank_type"] == "external"
+        assert [c.id for c in reranked] == ["c2", "c1"]
+        assert all(c.metadata["rerank_adjusted"] for c in reranked)